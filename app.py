@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from functools import partial
+
+import pandas as pd
 import streamlit as st
 
 from scraper import (
@@ -11,6 +14,30 @@ from scraper import (
     scrape_events,
 )
 
+
+@st.cache_data(ttl=3600, show_spinner="Cargando filtros disponibles desde PULEP...")
+def _cached_filter_options() -> dict:
+    return extract_filter_options(_get_events_page(_make_session()))
+
+
+@st.cache_data(ttl=1800, show_spinner=False, max_entries=32)
+def _cached_scrape(
+    filter_items: tuple[tuple[str, str], ...],
+    include_details: bool,
+    max_details: int | None,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    return scrape_events(
+        filters=dict(filter_items),
+        include_details=include_details,
+        max_details=max_details,
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _cached_excel_bytes(df: pd.DataFrame, sheet_name: str) -> bytes:
+    return dataframe_to_excel_bytes(df, sheet_name)
+
+
 st.set_page_config(page_title="Scraper PULEP Eventos", layout="wide")
 st.title("Scraper PULEP - Consulta de Eventos")
 st.caption(
@@ -19,13 +46,11 @@ st.caption(
 )
 
 if "filter_options" not in st.session_state:
-    with st.spinner("Cargando filtros disponibles desde PULEP..."):
-        try:
-            html = _get_events_page(_make_session())
-            st.session_state.filter_options = extract_filter_options(html)
-        except Exception as exc:  # noqa: BLE001
-            st.session_state.filter_options = {}
-            st.error(f"No fue posible cargar filtros automáticamente: {exc}")
+    try:
+        st.session_state.filter_options = _cached_filter_options()
+    except Exception as exc:  # noqa: BLE001
+        st.session_state.filter_options = {}
+        st.error(f"No fue posible cargar filtros automáticamente: {exc}")
 
 options = st.session_state.get("filter_options", {})
 
@@ -74,15 +99,15 @@ if submitted:
 
     with st.spinner("Extrayendo información de eventos..."):
         try:
-            basic_df, detail_df = scrape_events(
-                filters=filtros,
-                include_details=include_detail,
-                max_details=detail_limit,
-            )
+            scrape_key = (tuple(sorted(filtros.items())), include_detail, detail_limit)
+            basic_df, detail_df = _cached_scrape(*scrape_key)
         except Exception as exc:  # noqa: BLE001
             st.error(f"No fue posible completar la extracción: {exc}")
             st.stop()
 
+    if "error" in detail_df.columns:
+        _cached_scrape.clear(*scrape_key)
+
     st.success(f"Consulta finalizada. Registros base: {len(basic_df)} | Detalles: {len(detail_df)}")
 
     tab1, tab2 = st.tabs(["Información básica", "Información detallada"])
@@ -91,7 +116,7 @@ if submitted:
         st.dataframe(basic_df, use_container_width=True)
         st.download_button(
             "Descargar Excel de información básica",
-            data=dataframe_to_excel_bytes(basic_df, "eventos_resumen"),
+            data=partial(_cached_excel_bytes, basic_df, "eventos_resumen"),
             file_name="pulep_eventos_resumen.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         )
@@ -100,7 +125,7 @@ if submitted:
         st.dataframe(detail_df, use_container_width=True)
         st.download_button(
             "Descargar Excel de información detallada",
-            data=dataframe_to_excel_bytes(detail_df, "eventos_detalle"),
+            data=partial(_cached_excel_bytes, detail_df, "eventos_detalle"),
             file_name="pulep_eventos_detalle.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         )
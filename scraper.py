@@ -2,32 +2,73 @@
 
 from __future__ import annotations
 
+import codecs
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from io import BytesIO
+from itertools import chain
 from typing import Dict, Iterable, List, Tuple
 from urllib.parse import urljoin
 
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
+import xlsxwriter
+from bs4 import BeautifulSoup, FeatureNotFound
+from lxml import etree
+from lxml import html as lxml_html
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 BASE_URL = "https://pulepapp.mincultura.gov.co"
 EVENTS_PATH = "/Informespublicos/eventos"
 
+_XP_TABLES = etree.XPath("//table")
+_XP_HEADERS = etree.XPath(".//th")
+_XP_THEAD_HEADERS = etree.XPath("./thead//th")
+_XP_BODY_ROWS = etree.XPath("./tbody/tr")
+_XP_ROWS = etree.XPath(".//tr")
+_XP_CELLS = etree.XPath("./td")
+_XP_LINK_HREF = etree.XPath(".//a/@href")
+_XP_KV_ROWS = etree.XPath("//table//tr[count(./*[self::th or self::td]) >= 2]")
+_XP_KV_CELLS = etree.XPath("./th | ./td")
+_XP_LABELS = etree.XPath("//label | //strong | //b")
+_XP_VISIBLE_TEXT = etree.XPath("//text()[not(ancestor::script or ancestor::style)]")
+
+_PARSERS = threading.local()
+
+_XLSX_MAX_STRING = 32767
+
 
 @dataclass
 class ScraperConfig:
     timeout: int = 40
+    detail_workers: int = 8
+    max_retries: int = 3
+    backoff_factor: float = 0.3
     user_agent: str = (
         "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
         "(KHTML, like Gecko) Chrome/121.0 Safari/537.36"
     )
 
 
+_CFG = ScraperConfig()
+
+
 def _make_session(config: ScraperConfig | None = None) -> requests.Session:
-    cfg = config or ScraperConfig()
+    cfg = config or _CFG
     session = requests.Session()
-    session.headers.update({"User-Agent": cfg.user_agent})
+    session.headers.update({"User-Agent": cfg.user_agent, "Accept-Encoding": "gzip, deflate"})
+    retries = Retry(
+        total=cfg.max_retries,
+        connect=1,
+        read=0,
+        backoff_factor=cfg.backoff_factor,
+        status_forcelist=[429, 502, 503, 504],
+    )
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
     return session
 
 
@@ -35,15 +76,22 @@ def _get_events_page(session: requests.Session, params: Dict[str, str] | None =
     response = session.get(
         urljoin(BASE_URL, EVENTS_PATH),
         params=params,
-        timeout=ScraperConfig().timeout,
+        timeout=_CFG.timeout,
     )
     response.raise_for_status()
     return response.text
 
 
+def _make_soup(html: str) -> BeautifulSoup:
+    try:
+        return BeautifulSoup(html, "lxml")
+    except FeatureNotFound:
+        return BeautifulSoup(html, "html.parser")
+
+
 def extract_filter_options(html: str) -> Dict[str, Dict[str, str]]:
     """Devuelve las opciones de todos los select del formulario de filtros."""
-    soup = BeautifulSoup(html, "html.parser")
+    soup = _make_soup(html)
     filters: Dict[str, Dict[str, str]] = {}
 
     form = soup.find("form")
@@ -65,13 +113,54 @@ def extract_filter_options(html: str) -> Dict[str, Dict[str, str]]:
     return filters
 
 
-def _find_results_table(soup: BeautifulSoup):
-    tables = soup.find_all("table")
+def _html_parser(encoding: str | None = None) -> lxml_html.HTMLParser:
+    parsers = getattr(_PARSERS, "by_encoding", None)
+    if parsers is None:
+        parsers = _PARSERS.by_encoding = {}
+    parser = parsers.get(encoding)
+    if parser is None:
+        parser = lxml_html.HTMLParser(encoding=encoding, remove_comments=True, collect_ids=False)
+        parsers[encoding] = parser
+    return parser
+
+
+def _lxml_encoding(encoding: str | None) -> str | None:
+    if not encoding:
+        return None
+    try:
+        name = codecs.lookup(encoding).name
+        if name == "ascii":
+            return None
+        _html_parser(name)
+    except LookupError:
+        return None
+    return name
+
+
+def _html_root(html: str | bytes, encoding: str | None = None):
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml_html.fromstring(html, parser=_html_parser(encoding))
+    except ValueError:
+        if isinstance(html, bytes):
+            raise
+        return _html_root(html.encode("utf-8"), "utf-8")
+    except etree.ParserError:
+        return None
+
+
+def _text(element) -> str:
+    return " ".join(chunk.strip() for chunk in element.itertext() if chunk.strip())
+
+
+def _find_results_table(root):
+    tables = _XP_TABLES(root)
     if not tables:
         return None
 
     for table in tables:
-        headers = [h.get_text(" ", strip=True).lower() for h in table.find_all("th")]
+        headers = [_text(th).lower() for th in _XP_HEADERS(table)]
         if any("evento" in h for h in headers):
             return table
 
@@ -80,64 +169,84 @@ def _find_results_table(soup: BeautifulSoup):
 
 def parse_events_table(html: str) -> pd.DataFrame:
     """Parsea la tabla de resultados de eventos y devuelve un DataFrame."""
-    soup = BeautifulSoup(html, "html.parser")
-    table = _find_results_table(soup)
+    root = _html_root(html)
+    table = _find_results_table(root) if root is not None else None
     if table is None:
         return pd.DataFrame()
 
-    header_cells = table.find("thead")
-    headers = [
-        th.get_text(" ", strip=True)
-        for th in (header_cells.find_all("th") if header_cells else table.find_all("th"))
-    ]
+    headers = [_text(th) for th in (_XP_THEAD_HEADERS(table) or _XP_HEADERS(table))]
 
-    body = table.find("tbody") or table
-    rows = []
-    for tr in body.find_all("tr"):
-        cells = tr.find_all("td")
+    rows: List[List[str]] = []
+    detail_hrefs: List[str | None] = []
+    for tr in _XP_BODY_ROWS(table) or _XP_ROWS(table):
+        cells = _XP_CELLS(tr)
         if not cells:
             continue
-        row = [c.get_text(" ", strip=True) for c in cells]
+        rows.append([_text(c) for c in cells])
+
+        detail_link = _XP_LINK_HREF(tr)[:1]
+        detail_hrefs.append(detail_link[0] if detail_link else None)
 
-        detail_link = tr.find("a", href=True)
-        row_dict = {headers[idx] if idx < len(headers) else f"col_{idx+1}": value for idx, value in enumerate(row)}
-        row_dict["detalle_url"] = urljoin(BASE_URL, detail_link["href"]) if detail_link else ""
-        rows.append(row_dict)
+    if not rows:
+        return pd.DataFrame()
 
-    return pd.DataFrame(rows)
+    width = max(len(row) for row in rows)
+    names = [headers[idx] if idx < len(headers) else f"col_{idx+1}" for idx in range(width)]
+    columns = zip(*(row + [None] * (width - len(row)) for row in rows))
+    df = pd.DataFrame({name: list(values) for name, values in zip(names, columns)})
+    df["detalle_url"] = [urljoin(BASE_URL, href) if href is not None else "" for href in detail_hrefs]
+    return df
 
 
-def parse_event_detail(html: str) -> Dict[str, str]:
-    """Parsea una página de detalle y devuelve pares campo/valor."""
-    soup = BeautifulSoup(html, "html.parser")
+def parse_event_detail(html: str | bytes, encoding: str | None = None) -> Dict[str, str]:
+    """Parsea una página de detalle (texto o bytes) y devuelve pares campo/valor."""
+    root = _html_root(html, encoding)
     data: Dict[str, str] = {}
-
-    for table in soup.find_all("table"):
-        for tr in table.find_all("tr"):
-            cells = tr.find_all(["th", "td"])
-            if len(cells) >= 2:
-                key = cells[0].get_text(" ", strip=True)
-                value = cells[1].get_text(" ", strip=True)
-                if key:
-                    data[key] = value
-
-    for label in soup.find_all(["label", "strong", "b"]):
-        key = label.get_text(" ", strip=True).rstrip(":")
-        if not key:
+    if root is None:
+        data["contenido"] = ""
+        return data
+
+    for tr in _XP_KV_ROWS(root):
+        cells = _XP_KV_CELLS(tr)
+        key = _text(cells[0])
+        value = _text(cells[1])
+        if key:
+            data[key] = value
+
+    for label in _XP_LABELS(root):
+        key = _text(label).rstrip(":")
+        if not key or key in data:
             continue
-        sibling_text = ""
-        next_node = label.next_sibling
-        if next_node:
-            sibling_text = str(next_node).strip()
-        if sibling_text and key not in data:
-            data[key] = BeautifulSoup(sibling_text, "html.parser").get_text(" ", strip=True)
+        if label.tail is not None:
+            sibling_text = label.tail.strip()
+        else:
+            next_node = label.getnext()
+            is_element = next_node is not None and isinstance(next_node.tag, str)
+            sibling_text = _text(next_node) if is_element else ""
+        if sibling_text:
+            data[key] = sibling_text
 
     if not data:
-        data["contenido"] = soup.get_text(" ", strip=True)
+        data["contenido"] = " ".join(
+            chunk.strip() for chunk in _XP_VISIBLE_TEXT(root) if chunk.strip()
+        )
 
     return data
 
 
+def _fetch_and_parse_detail(session: requests.Session, url: str, idx: int) -> Dict[str, str]:
+    try:
+        response = session.get(url, timeout=_CFG.timeout)
+        response.raise_for_status()
+        encoding = _lxml_encoding(response.encoding)
+        detail = parse_event_detail(response.content if encoding else response.text, encoding)
+        detail["detalle_url"] = url
+        detail["indice"] = str(idx)
+        return detail
+    except Exception as exc:  # noqa: BLE001
+        return {"detalle_url": url, "error": str(exc), "indice": str(idx)}
+
+
 def scrape_events(
     filters: Dict[str, str],
     include_details: bool = True,
@@ -150,33 +259,48 @@ def scrape_events(
     if not include_details or basic_df.empty:
         return basic_df, pd.DataFrame()
 
-    detail_rows: List[Dict[str, str]] = []
     links = [u for u in basic_df.get("detalle_url", pd.Series(dtype=str)).tolist() if u]
     if max_details is not None:
         links = links[:max_details]
+    if not links:
+        return basic_df, pd.DataFrame()
 
-    for idx, url in enumerate(links, start=1):
-        try:
-            response = session.get(url, timeout=ScraperConfig().timeout)
-            response.raise_for_status()
-            detail = parse_event_detail(response.text)
-            detail["detalle_url"] = url
-            detail["indice"] = str(idx)
-            detail_rows.append(detail)
-        except requests.RequestException as exc:
-            detail_rows.append({"detalle_url": url, "error": str(exc), "indice": str(idx)})
+    detail_rows: List[Dict[str, str]] = [{} for _ in links]
+    with ThreadPoolExecutor(max_workers=_CFG.detail_workers) as executor:
+        futures = {
+            executor.submit(_fetch_and_parse_detail, session, url, idx): idx
+            for idx, url in enumerate(links, start=1)
+        }
+        for future in as_completed(futures):
+            detail_rows[futures[future] - 1] = future.result()
 
-    return basic_df, pd.DataFrame(detail_rows)
+    columns = list(dict.fromkeys(key for row in detail_rows for key in row))
+    return basic_df, pd.DataFrame.from_records(detail_rows, columns=columns)
 
 
 def dataframe_to_excel_bytes(df: pd.DataFrame, sheet_name: str) -> bytes:
     output = BytesIO()
-    with pd.ExcelWriter(output, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name=sheet_name[:31] or "datos")
+    workbook = xlsxwriter.Workbook(output, {"constant_memory": True, "strings_to_urls": False})
+    worksheet = workbook.add_worksheet(sheet_name[:31] or "datos")
+    header = [str(col) for col in df.columns]
+    rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    for row_idx, row in enumerate(chain([header], rows)):
+        cells = [value[:_XLSX_MAX_STRING] if isinstance(value, str) else value for value in row]
+        error = worksheet.write_row(row_idx, 0, cells)
+        if error:
+            workbook.close()
+            raise ValueError(f"No fue posible escribir la fila {row_idx} en Excel (código {error}).")
+    workbook.close()
     output.seek(0)
     return output.getvalue()
 
 
+def dataframe_to_parquet_bytes(df: pd.DataFrame) -> bytes:
+    output = BytesIO()
+    df.to_parquet(output, engine="pyarrow", compression="zstd", index=False)
+    return output.getvalue()
+
+
 def normalize_filter_values(raw_values: Dict[str, object]) -> Dict[str, str]:
     cleaned: Dict[str, str] = {}
     for key, value in raw_values.items():